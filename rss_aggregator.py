@@ -5,17 +5,86 @@ import sqlite3
 import uuid
 import hashlib
 import json
+import math
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import quoteattr
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 
+# Stored-data version kept in PRAGMA user_version; see _migrate.
+_SCHEMA_VERSION = 1
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds (default 999).
+_MAX_SQL_VARS = 500
+
+# Feed fields in declaration order, so rows unpack straight into Feed(*row).
+_FEED_COLUMNS = (
+    "id, name, url, category, fetch_interval_min, last_fetched, status, "
+    "error_message, item_count, created_at"
+)
+
+# FeedItem fields in declaration order, so rows unpack straight into
+# FeedItem(*row). The "[BOOL]" aliases route the flags through the BOOL
+# converter (connections use PARSE_COLNAMES).
+_ITEM_COLUMNS = (
+    "fi.id, fi.feed_id, fi.title, fi.url, fi.summary, fi.author, "
+    "fi.published_at, fi.fingerprint, "
+    'fi.is_read AS "is_read [BOOL]", fi.is_bookmarked AS "is_bookmarked [BOOL]", '
+    "fi.created_at"
+)
+
+# Keeps feed_items_fts in step with inserts; bulk_refresh_many drops it for
+# the duration of a batch and restores it afterwards.
+_FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS feed_items_ai AFTER INSERT ON feed_items BEGIN
+        INSERT INTO feed_items_fts(rowid, title, summary, author)
+        VALUES (new.rowid, new.title, new.summary, new.author);
+    END
+"""
+
+# Backoff between BEGIN IMMEDIATE attempts once another writer has held the
+# lock past the connection's busy timeout.
+_BUSY_RETRY_DELAYS = (0.1, 0.5, 2.0)
+
+# Per-connection tuning; journal_mode=WAL is persistent and set in _init_db.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA analysis_limit=400",
+)
+
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _is_busy(error: Exception) -> bool:
+    """True for SQLITE_BUSY/SQLITE_LOCKED, i.e. contention rather than a fault."""
+    return isinstance(error, sqlite3.OperationalError) and "locked" in str(error)
+
+
+def _begin_immediate(conn: sqlite3.Connection) -> None:
+    """Take the write lock, retrying with backoff while other writers hold it."""
+    for delay in _BUSY_RETRY_DELAYS + (None,):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            return
+        except sqlite3.OperationalError as e:
+            if delay is None or not _is_busy(e):
+                raise
+            time.sleep(delay)
+
+
+sqlite3.register_converter("BOOL", lambda value: value != b"0")
+
+
 class FeedStatus(str, Enum):
     ACTIVE = "active"
     PAUSED = "paused"
@@ -28,6 +97,9 @@ class AggregatorConfig:
     dedupe_window_days: int = 30
     fetch_timeout: int = 10
     max_summary_length: int = 500
+    bloom_capacity: int = 100_000
+    bloom_error_rate: float = 0.01
+    max_workers: int = 8
 
 
 @dataclass
@@ -65,6 +137,34 @@ class FeedItem:
         return asdict(self)
 
 
+class BloomFilter:
+    """Fixed-size Bloom filter over hex fingerprints.
+
+    Membership tests may return false positives but never false negatives,
+    so a miss proves a fingerprint has not been seen.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, fingerprint: str) -> List[int]:
+        # Double hashing over the two 32-bit halves of the fingerprint.
+        h1 = int(fingerprint[:8], 16)
+        h2 = int(fingerprint[8:16], 16) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, fingerprint: str) -> None:
+        for idx in self._indexes(fingerprint):
+            self._bits[idx >> 3] |= 1 << (idx & 7)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        bits = self._bits
+        return all(bits[idx >> 3] & (1 << (idx & 7)) for idx in self._indexes(fingerprint))
+
+
 class RSSAggregator:
     """RSS/Atom feed aggregator with deduplication."""
 
@@ -91,19 +191,80 @@ class RSSAggregator:
         ]
     }
 
+    # Hot single-row statements, shared with bulk variants such as
+    # mark_read_many so both paths run the same SQL.
+    _SQL_GET_FEED = f"SELECT {_FEED_COLUMNS} FROM feeds WHERE id=?"
+    _SQL_GET_FEED_BY_URL = f"SELECT {_FEED_COLUMNS} FROM feeds WHERE url=?"
+    _SQL_MARK_READ = "UPDATE feed_items SET is_read=1 WHERE id=?"
+    _SQL_MARK_UNREAD = "UPDATE feed_items SET is_read=0 WHERE id=?"
+    _SQL_BOOKMARK = "UPDATE feed_items SET is_bookmarked=1 WHERE id=?"
+    _SQL_UNBOOKMARK = "UPDATE feed_items SET is_bookmarked=0 WHERE id=?"
+
     def __init__(self, db_path: str = "rss_aggregator.db",
                  config: Optional[AggregatorConfig] = None):
         self.db_path = db_path
         self.config = config or AggregatorConfig()
+        self._bloom = BloomFilter(self.config.bloom_capacity,
+                                  self.config.bloom_error_rate)
+        # (rowid epoch, MAX(rowid)) of feed_items already folded into the
+        # Bloom filter; epoch -1 makes the first sync scan the whole table.
+        self._bloom_mark: Tuple[int, int] = (-1, 0)
+        self._conns: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._conns_lock = threading.Lock()
+        # refresh_all's workers, kept for the life of the instance so their
+        # per-thread connections are reused across calls.
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Sample items with the config-time truncation already applied, so
+        # _simulate_fetch only has to stamp publication times.
+        self._prepared_samples = {
+            key: [{
+                "title": item["title"],
+                "url": item["url"],
+                "summary": item["summary"][:self.config.max_summary_length],
+                "author": item["author"],
+            } for item in items[:self.config.max_items_per_feed]]
+            for key, items in self.SAMPLE_FEEDS.items()
+        }
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Return the calling thread's connection, opening it on first use.
+
+        Connections are cached per thread and reused across calls; ones left
+        behind by finished threads are closed when the next one is opened.
+        """
+        thread = threading.current_thread()
+        conn = self._conns.get(thread)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_COLNAMES)
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            with self._conns_lock:
+                for dead in [t for t in self._conns if not t.is_alive()]:
+                    self._conns.pop(dead).close()
+                self._conns[thread] = conn
         return conn
 
+    def close(self) -> None:
+        """Stop the refresh workers and close all cached connections.
+
+        Both are recreated lazily by later calls.
+        """
+        with self._conns_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._conns_lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+
     def _init_db(self):
         with self._connect() as conn:
+            # WAL lets search/by_category readers run while a refresh writes.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS feeds (
                     id TEXT PRIMARY KEY,
@@ -136,70 +297,186 @@ class RSSAggregator:
                 CREATE VIRTUAL TABLE IF NOT EXISTS feed_items_fts
                     USING fts5(title, summary, author, content=feed_items, content_rowid=rowid);
 
-                CREATE TRIGGER IF NOT EXISTS feed_items_ai AFTER INSERT ON feed_items BEGIN
-                    INSERT INTO feed_items_fts(rowid, title, summary, author)
-                    VALUES (new.rowid, new.title, new.summary, new.author);
-                END;
-
                 CREATE TRIGGER IF NOT EXISTS feed_items_ad AFTER DELETE ON feed_items BEGIN
                     INSERT INTO feed_items_fts(feed_items_fts, rowid, title, summary, author)
                     VALUES ('delete', old.rowid, old.title, old.summary, old.author);
                 END;
 
+                -- rowid_epoch changes whenever feed_items rowids may be handed
+                -- out again (deletes, VACUUM); see _sync_bloom.
+                CREATE TABLE IF NOT EXISTS feed_items_meta (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    rowid_epoch INTEGER NOT NULL DEFAULT 0
+                );
+                INSERT OR IGNORE INTO feed_items_meta (id) VALUES (1);
+
+                CREATE TRIGGER IF NOT EXISTS feed_items_ad_epoch AFTER DELETE ON feed_items BEGIN
+                    UPDATE feed_items_meta SET rowid_epoch = rowid_epoch + 1 WHERE id = 1;
+                END;
+
                 CREATE INDEX IF NOT EXISTS idx_items_feed ON feed_items(feed_id);
                 CREATE INDEX IF NOT EXISTS idx_items_fingerprint ON feed_items(fingerprint);
                 CREATE INDEX IF NOT EXISTS idx_items_published ON feed_items(published_at DESC);
             """)
+            conn.execute(_FTS_INSERT_TRIGGER)
+            self._migrate(conn)
+            self._bloom_mark = self._sync_bloom(conn)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring data written by older releases up to _SCHEMA_VERSION."""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        _begin_immediate(conn)
+        # Re-check under the write lock in case another instance got here first.
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # Version 1: fingerprints moved from truncated SHA-256 to BLAKE2b,
+            # so recompute them from the stored title/url and drop the copies
+            # that now collide.
+            rows = conn.execute("SELECT rowid, title, url FROM feed_items").fetchall()
+            conn.executemany(
+                "UPDATE feed_items SET fingerprint=? WHERE rowid=?",
+                [(self._fingerprint(r["title"], r["url"]), r["rowid"]) for r in rows],
+            )
+            removed = conn.execute("""
+                DELETE FROM feed_items
+                WHERE rowid NOT IN (
+                    SELECT MIN(rowid) FROM feed_items GROUP BY fingerprint
+                )
+            """).rowcount
+            if removed:
+                conn.execute("""
+                    UPDATE feeds SET item_count=(
+                        SELECT COUNT(*) FROM feed_items WHERE feed_id=feeds.id
+                    )
+                """)
+        conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        conn.commit()
+
+    @staticmethod
+    def _bloom_position(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Return feed_items' (rowid epoch, MAX(rowid)) as conn sees it."""
+        return tuple(conn.execute("""
+            SELECT (SELECT rowid_epoch FROM feed_items_meta WHERE id = 1),
+                   COALESCE(MAX(rowid), 0)
+            FROM feed_items
+        """).fetchone())
+
+    def _sync_bloom(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Add rows stored since the last sync, by any connection, to the filter.
+
+        Returns the position reached. It only becomes the new _bloom_mark once
+        the caller's transaction commits, so rows that are rolled back are
+        never treated as already folded in.
+        """
+        epoch, max_rowid = self._bloom_position(conn)
+        last_epoch, last_rowid = self._bloom_mark
+        if epoch != last_epoch:
+            # Rows were deleted or renumbered, so rowids below the mark may
+            # now hold rows the filter has never seen; rebuild from scratch.
+            self._bloom = BloomFilter(self.config.bloom_capacity,
+                                      self.config.bloom_error_rate)
+            last_rowid = 0
+        for row in conn.execute(
+            "SELECT fingerprint FROM feed_items WHERE rowid > ? AND rowid <= ?",
+            (last_rowid, max_rowid),
+        ):
+            self._bloom.add(row[0])
+        return epoch, max_rowid
 
     @staticmethod
     def _fingerprint(title: str, url: str) -> str:
-        """Generate a deduplication fingerprint."""
-        text = f"{title.lower().strip()}{url.lower().strip()}"
-        return hashlib.sha256(text.encode()).hexdigest()[:16]
+        """Generate a 16-hex-char deduplication fingerprint."""
+        # One lower()/encode()/hash call on the joined string; the result is
+        # identical to hashing the lowered parts separately.
+        return hashlib.blake2b(f"{title.strip()}|{url.strip()}".lower().encode(),
+                               digest_size=8).hexdigest()
+
+    @staticmethod
+    def _existing_fingerprints(conn: sqlite3.Connection,
+                               fingerprints: List[str]) -> set:
+        """Return the subset of fingerprints already stored, in batched IN queries."""
+        existing = set()
+        unique = list(dict.fromkeys(fingerprints))
+        for start in range(0, len(unique), _MAX_SQL_VARS):
+            chunk = unique[start:start + _MAX_SQL_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            existing.update(row[0] for row in conn.execute(
+                f"SELECT fingerprint FROM feed_items WHERE fingerprint IN ({placeholders})",
+                chunk,
+            ))
+        return existing
 
     def add_feed(self, name: str, url: str, category: str = "general",
                  fetch_interval_min: int = 60) -> Feed:
         """Add a new RSS/Atom feed."""
-        feed_id = str(uuid.uuid4())
+        feed_id = uuid.uuid4().hex
         feed = Feed(
             id=feed_id, name=name, url=url,
             category=category, fetch_interval_min=fetch_interval_min,
         )
         with self._connect() as conn:
-            conn.execute("""
-                INSERT OR IGNORE INTO feeds
+            # The no-op update makes a duplicate URL return the stored row,
+            # so one statement covers both insert and lookup.
+            row = conn.execute(f"""
+                INSERT INTO feeds
                 (id, name, url, category, fetch_interval_min, status, created_at)
                 VALUES (?, ?, ?, ?, ?, 'active', ?)
+                ON CONFLICT(url) DO UPDATE SET url=excluded.url
+                RETURNING {_FEED_COLUMNS}
             """, (feed.id, feed.name, feed.url, feed.category,
-                  feed.fetch_interval_min, feed.created_at))
-        return self.get_feed_by_url(url) or feed
+                  feed.fetch_interval_min, feed.created_at)).fetchone()
+        return Feed(*row)
+
+    def bulk_add_feeds(self, feeds: List[Dict]) -> List[Feed]:
+        """Add many feeds in one transaction, e.g. from an OPML import.
+
+        Each entry takes add_feed's arguments as keys. Returns one Feed per
+        entry; URLs that are already stored come back unchanged.
+        """
+        new = [Feed(id=uuid.uuid4().hex, name=f["name"], url=f["url"],
+                    category=f.get("category", "general"),
+                    fetch_interval_min=f.get("fetch_interval_min", 60))
+               for f in feeds]
+        urls = list(dict.fromkeys(f.url for f in new))
+        stored: Dict[str, Feed] = {}
+        with self._connect() as conn:
+            # executemany discards RETURNING rows, so read them back in bulk.
+            conn.executemany("""
+                INSERT INTO feeds
+                (id, name, url, category, fetch_interval_min, status, created_at)
+                VALUES (?, ?, ?, ?, ?, 'active', ?)
+                ON CONFLICT(url) DO NOTHING
+            """, [(f.id, f.name, f.url, f.category, f.fetch_interval_min,
+                   f.created_at) for f in new])
+            for start in range(0, len(urls), _MAX_SQL_VARS):
+                chunk = urls[start:start + _MAX_SQL_VARS]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT {_FEED_COLUMNS} FROM feeds WHERE url IN ({placeholders})",
+                    chunk,
+                ):
+                    stored[row["url"]] = Feed(*row)
+        return [stored[f.url] for f in new]
 
     def get_feed(self, feed_id: str) -> Optional[Feed]:
         with self._connect() as conn:
-            row = conn.execute("SELECT * FROM feeds WHERE id=?", (feed_id,)).fetchone()
-        return Feed(**dict(row)) if row else None
+            row = conn.execute(self._SQL_GET_FEED, (feed_id,)).fetchone()
+        return Feed(*row) if row else None
 
     def get_feed_by_url(self, url: str) -> Optional[Feed]:
         with self._connect() as conn:
-            row = conn.execute("SELECT * FROM feeds WHERE url=?", (url,)).fetchone()
-        return Feed(**dict(row)) if row else None
+            row = conn.execute(self._SQL_GET_FEED_BY_URL, (url,)).fetchone()
+        return Feed(*row) if row else None
 
     def _simulate_fetch(self, feed: Feed) -> List[Dict]:
         """Simulate fetching and parsing XML feed (no network needed)."""
-        key = feed.category if feed.category in self.SAMPLE_FEEDS else "default"
-        items = self.SAMPLE_FEEDS[key]
+        key = feed.category if feed.category in self._prepared_samples else "default"
         now = datetime.now(timezone.utc)
-        result = []
-        for i, item in enumerate(items[:self.config.max_items_per_feed]):
-            pub_time = now - timedelta(hours=i * 6)
-            result.append({
-                "title": item["title"],
-                "url": item["url"],
-                "summary": item["summary"][:self.config.max_summary_length],
-                "author": item["author"],
-                "published_at": pub_time.isoformat(),
-            })
-        return result
+        return [
+            {**item, "published_at": (now - timedelta(hours=i * 6)).isoformat()}
+            for i, item in enumerate(self._prepared_samples[key])
+        ]
 
     def refresh(self, feed_id: str) -> dict:
         """Fetch and store new items for a feed."""
@@ -209,52 +486,144 @@ class RSSAggregator:
         if feed.status == FeedStatus.PAUSED.value:
             return {"feed_id": feed_id, "skipped": True, "reason": "paused"}
 
+        conn = self._connect()
         try:
             raw_items = self._simulate_fetch(feed)
-            new_count = 0
-            dup_count = 0
-
-            for raw in raw_items:
-                fp = self._fingerprint(raw["title"], raw["url"])
-                with self._connect() as conn:
-                    existing = conn.execute(
-                        "SELECT id FROM feed_items WHERE fingerprint=?", (fp,)
-                    ).fetchone()
-                    if existing:
-                        dup_count += 1
-                        continue
-                    item_id = str(uuid.uuid4())
-                    conn.execute("""
-                        INSERT INTO feed_items
-                        (id, feed_id, title, url, summary, author, published_at,
-                         fingerprint, is_read, is_bookmarked, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?)
-                    """, (item_id, feed_id, raw["title"], raw["url"],
-                          raw.get("summary", ""), raw.get("author", ""),
-                          raw.get("published_at", _now()), fp, _now()))
-                    new_count += 1
-
-            with self._connect() as conn:
-                total = conn.execute(
-                    "SELECT COUNT(*) FROM feed_items WHERE feed_id=?", (feed_id,)
-                ).fetchone()[0]
-                conn.execute("""
-                    UPDATE feeds SET last_fetched=?, status='active', item_count=?
-                    WHERE id=?
-                """, (_now(), total, feed_id))
+            # One write transaction for the whole batch: a single lock
+            # acquisition and a single commit instead of one per item.
+            _begin_immediate(conn)
+            self._sync_bloom(conn)
+            result = self._store_items(conn, feed_id, raw_items)
+            # Still under the write lock, so every row up to here is either
+            # synced or one of ours and already in the filter.
+            mark = self._bloom_position(conn)
+            conn.commit()
+            self._bloom_mark = mark
+            return result
 
-            return {
-                "feed_id": feed_id,
-                "new_items": new_count,
-                "duplicates": dup_count,
-                "total_items": total,
-            }
+        except Exception as e:
+            if _is_busy(e):
+                # Lock contention says nothing about the feed; keep it active.
+                conn.rollback()
+            else:
+                self._mark_error(conn, feed_id, e)
+            raise
+
+    def _store_items(self, conn: sqlite3.Connection, feed_id: str,
+                     raw_items: List[Dict]) -> dict:
+        """Insert the new items of a fetch; the caller holds the write lock."""
+        now = _now()
+        fingerprints = [self._fingerprint(r["title"], r["url"]) for r in raw_items]
+        # The caller has synced the filter with rows other instances or
+        # processes stored, so only Bloom hits can be stored already and
+        # misses skip the SQL probe. The filter is only read and updated
+        # while holding the write lock, which keeps it consistent across
+        # refresh threads.
+        existing = self._existing_fingerprints(
+            conn, [fp for fp in fingerprints if fp in self._bloom])
+        rows = []
+        for raw, fp in zip(raw_items, fingerprints):
+            if fp in existing:
+                continue
+            existing.add(fp)
+            # Added before commit: a rollback only leaves a harmless
+            # false positive behind.
+            self._bloom.add(fp)
+            rows.append((uuid.uuid4().hex, feed_id, raw["title"], raw["url"],
+                         raw.get("summary", ""), raw.get("author", ""),
+                         raw.get("published_at", now), fp, now))
+        conn.executemany("""
+            INSERT INTO feed_items
+            (id, feed_id, title, url, summary, author, published_at,
+             fingerprint, is_read, is_bookmarked, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?)
+        """, rows)
+
+        total = conn.execute(
+            "SELECT COUNT(*) FROM feed_items WHERE feed_id=?", (feed_id,)
+        ).fetchone()[0]
+        conn.execute("""
+            UPDATE feeds SET last_fetched=?, status='active', item_count=?
+            WHERE id=?
+        """, (now, total, feed_id))
+
+        return {
+            "feed_id": feed_id,
+            "new_items": len(rows),
+            "duplicates": len(raw_items) - len(rows),
+            "total_items": total,
+        }
+
+    @staticmethod
+    def _mark_error(conn: sqlite3.Connection, feed_id: str, error: Exception) -> None:
+        """Roll back the failed batch and record the error on the feed.
+
+        Recording is best effort: if it fails as well, the caller still
+        re-raises the original error instead of this one.
+        """
+        conn.rollback()
+        try:
+            _begin_immediate(conn)
+            conn.execute("""
+                UPDATE feeds SET status='error', error_message=? WHERE id=?
+            """, (str(error), feed_id))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+
+    def bulk_refresh_many(self, feed_ids: List[str]) -> List[dict]:
+        """Refresh several feeds in one transaction with deferred FTS indexing.
+
+        Intended for large initial imports. The FTS insert trigger is dropped
+        for the batch and the new rows are indexed with one INSERT ... SELECT
+        at the end. Any failure rolls back the whole batch.
+        """
+        feeds = []
+        for feed_id in feed_ids:
+            feed = self.get_feed(feed_id)
+            if not feed:
+                raise ValueError(f"Feed {feed_id} not found")
+            feeds.append(feed)
+
+        results = []
+        conn = self._connect()
+        # The feed being worked on, so a failure can be recorded against it.
+        feed_id = None
+        try:
+            fetched = {}
+            for feed in feeds:
+                if feed.status != FeedStatus.PAUSED.value:
+                    feed_id = feed.id
+                    fetched[feed.id] = self._simulate_fetch(feed)
+            # Failures outside a feed's own fetch/store are not its fault.
+            feed_id = None
+
+            _begin_immediate(conn)
+            last_rowid = self._sync_bloom(conn)[1]
+            conn.execute("DROP TRIGGER IF EXISTS feed_items_ai")
+            for feed in feeds:
+                if feed.id not in fetched:
+                    results.append({"feed_id": feed.id, "skipped": True, "reason": "paused"})
+                    continue
+                feed_id = feed.id
+                results.append(self._store_items(conn, feed.id, fetched[feed.id]))
+                feed_id = None
+            # Rowids grow from MAX(rowid), so everything above the mark is new.
+            conn.execute("""
+                INSERT INTO feed_items_fts(rowid, title, summary, author)
+                SELECT rowid, title, summary, author FROM feed_items WHERE rowid > ?
+            """, (last_rowid,))
+            conn.execute(_FTS_INSERT_TRIGGER)
+            mark = self._bloom_position(conn)
+            conn.commit()
+            self._bloom_mark = mark
+            return results
 
         except Exception as e:
-            with self._connect() as conn:
-                conn.execute("""
-                    UPDATE feeds SET status='error', error_message=? WHERE id=?
-                """, (str(e), feed_id))
+            if feed_id is None or _is_busy(e):
+                conn.rollback()
+            else:
+                self._mark_error(conn, feed_id, e)
             raise
 
     def refresh_all(self) -> List[dict]:
@@ -263,126 +632,201 @@ class RSSAggregator:
             feeds = conn.execute(
                 "SELECT id FROM feeds WHERE status='active'"
             ).fetchall()
+        if not feeds:
+            return []
+        # Fetches overlap across worker threads; each thread writes through
+        # its own connection and BEGIN IMMEDIATE serializes the stores, with
+        # _begin_immediate retrying when the lock stays contended.
+        with self._conns_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=max(1, self.config.max_workers))
+            pool = self._pool
+        futures = [(row["id"], pool.submit(self.refresh, row["id"]))
+                   for row in feeds]
         results = []
-        for row in feeds:
+        for feed_id, future in futures:
             try:
-                result = self.refresh(row["id"])
-                results.append(result)
+                results.append(future.result())
             except Exception as e:
-                results.append({"feed_id": row["id"], "error": str(e)})
+                results.append({"feed_id": feed_id, "error": str(e)})
+        if any(r.get("new_items") for r in results):
+            self._refresh_planner_stats()
         return results
 
+    def _refresh_planner_stats(self) -> None:
+        """Keep query planner statistics current after bulk inserts.
+
+        Best effort: the items are already committed, so a locked or failing
+        ANALYZE is skipped rather than raised; the next refresh retries it.
+        """
+        conn = self._connect()
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'"
+        ).fetchone()
+        # PRAGMA optimize only re-analyzes tables whose stats have drifted;
+        # a database that was never analyzed needs one seeding ANALYZE.
+        try:
+            conn.execute("PRAGMA optimize" if has_stats else "ANALYZE")
+        except sqlite3.OperationalError:
+            pass
+
     def mark_read(self, item_id: str) -> bool:
         """Mark a feed item as read."""
         with self._connect() as conn:
-            result = conn.execute(
-                "UPDATE feed_items SET is_read=1 WHERE id=?", (item_id,)
-            )
+            result = conn.execute(self._SQL_MARK_READ, (item_id,))
         return result.rowcount > 0
 
     def mark_unread(self, item_id: str) -> bool:
         with self._connect() as conn:
-            result = conn.execute(
-                "UPDATE feed_items SET is_read=0 WHERE id=?", (item_id,)
-            )
+            result = conn.execute(self._SQL_MARK_UNREAD, (item_id,))
         return result.rowcount > 0
 
+    def mark_read_many(self, item_ids: List[str]) -> int:
+        """Mark several feed items as read; returns the number updated."""
+        with self._connect() as conn:
+            result = conn.executemany(
+                self._SQL_MARK_READ, [(item_id,) for item_id in item_ids]
+            )
+        return result.rowcount
+
     def bookmark(self, item_id: str) -> bool:
         """Bookmark a feed item."""
         with self._connect() as conn:
-            result = conn.execute(
-                "UPDATE feed_items SET is_bookmarked=1 WHERE id=?", (item_id,)
-            )
+            result = conn.execute(self._SQL_BOOKMARK, (item_id,))
         return result.rowcount > 0
 
     def unbookmark(self, item_id: str) -> bool:
         with self._connect() as conn:
-            result = conn.execute(
-                "UPDATE feed_items SET is_bookmarked=0 WHERE id=?", (item_id,)
-            )
+            result = conn.execute(self._SQL_UNBOOKMARK, (item_id,))
         return result.rowcount > 0
 
     def search(self, query: str, limit: int = 20) -> List[FeedItem]:
         """Full-text search using FTS5."""
         with self._connect() as conn:
-            rows = conn.execute("""
-                SELECT fi.* FROM feed_items fi
+            rows = conn.execute(f"""
+                SELECT {_ITEM_COLUMNS} FROM feed_items fi
                 JOIN feed_items_fts fts ON fi.rowid = fts.rowid
                 WHERE feed_items_fts MATCH ?
                 ORDER BY fi.published_at DESC
                 LIMIT ?
             """, (query, limit)).fetchall()
-        return [self._row_to_item(dict(r)) for r in rows]
+        return [FeedItem(*r) for r in rows]
+
+    def search_in_category(self, query: str, category: str,
+                           limit: int = 20) -> List[FeedItem]:
+        """Full-text search restricted to feeds in a category.
+
+        FTS matches are materialized in a CTE first so the planner keeps using
+        the FTS index instead of scanning once the category join is added.
+        The CTE over-fetches ``limit * 10`` matches to leave headroom for the
+        category filter.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                WITH fts_matches AS (
+                    SELECT rowid, bm25(feed_items_fts) AS score
+                    FROM feed_items_fts
+                    WHERE feed_items_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ?
+                )
+                SELECT {_ITEM_COLUMNS} FROM fts_matches fm
+                JOIN feed_items fi ON fi.rowid = fm.rowid
+                JOIN feeds f ON f.id = fi.feed_id
+                WHERE f.category=?
+                ORDER BY fi.published_at DESC
+                LIMIT ?
+            """, (query, limit * 10, category, limit)).fetchall()
+        return [FeedItem(*r) for r in rows]
 
     def by_category(self, category: str, limit: int = 50,
                     unread_only: bool = False) -> List[FeedItem]:
         """Get items from feeds in a category."""
         with self._connect() as conn:
             if unread_only:
-                rows = conn.execute("""
-                    SELECT fi.* FROM feed_items fi
+                rows = conn.execute(f"""
+                    SELECT {_ITEM_COLUMNS} FROM feed_items fi
                     JOIN feeds f ON fi.feed_id = f.id
                     WHERE f.category=? AND fi.is_read=0
                     ORDER BY fi.published_at DESC LIMIT ?
                 """, (category, limit)).fetchall()
             else:
-                rows = conn.execute("""
-                    SELECT fi.* FROM feed_items fi
+                rows = conn.execute(f"""
+                    SELECT {_ITEM_COLUMNS} FROM feed_items fi
                     JOIN feeds f ON fi.feed_id = f.id
                     WHERE f.category=?
                     ORDER BY fi.published_at DESC LIMIT ?
                 """, (category, limit)).fetchall()
-        return [self._row_to_item(dict(r)) for r in rows]
+        return [FeedItem(*r) for r in rows]
 
     def get_items(self, feed_id: str, limit: int = 50,
                   unread_only: bool = False) -> List[FeedItem]:
         with self._connect() as conn:
             if unread_only:
-                rows = conn.execute("""
-                    SELECT * FROM feed_items WHERE feed_id=? AND is_read=0
+                rows = conn.execute(f"""
+                    SELECT {_ITEM_COLUMNS} FROM feed_items fi WHERE feed_id=? AND is_read=0
                     ORDER BY published_at DESC LIMIT ?
                 """, (feed_id, limit)).fetchall()
             else:
-                rows = conn.execute("""
-                    SELECT * FROM feed_items WHERE feed_id=?
+                rows = conn.execute(f"""
+                    SELECT {_ITEM_COLUMNS} FROM feed_items fi WHERE feed_id=?
                     ORDER BY published_at DESC LIMIT ?
                 """, (feed_id, limit)).fetchall()
-        return [self._row_to_item(dict(r)) for r in rows]
+        return [FeedItem(*r) for r in rows]
 
     def get_bookmarks(self) -> List[FeedItem]:
         with self._connect() as conn:
-            rows = conn.execute("""
-                SELECT * FROM feed_items WHERE is_bookmarked=1
+            rows = conn.execute(f"""
+                SELECT {_ITEM_COLUMNS} FROM feed_items fi WHERE is_bookmarked=1
                 ORDER BY published_at DESC
             """).fetchall()
-        return [self._row_to_item(dict(r)) for r in rows]
-
-    @staticmethod
-    def _row_to_item(d: dict) -> FeedItem:
-        d["is_read"] = bool(d["is_read"])
-        d["is_bookmarked"] = bool(d["is_bookmarked"])
-        return FeedItem(**d)
+        return [FeedItem(*r) for r in rows]
 
     def deduplicate(self) -> dict:
-        """Remove duplicate items based on fingerprint, keep most recent."""
-        with self._connect() as conn:
-            dups = conn.execute("""
-                SELECT fingerprint, COUNT(*) as cnt, MIN(id) as keep_id
-                FROM feed_items
-                GROUP BY fingerprint
-                HAVING cnt > 1
-            """).fetchall()
+        """Remove duplicate items based on fingerprint, keep the first stored.
 
-            removed = 0
-            for dup in dups:
-                result = conn.execute("""
+        The fingerprint and published indexes are dropped for the bulk DELETE
+        and rebuilt once afterwards instead of being maintained per row.
+        """
+        removed = 0
+        with self._connect() as conn:
+            _begin_immediate(conn)
+            # Probe the fingerprint index first so a clean database never
+            # pays for dropping and rebuilding indexes.
+            has_dups = conn.execute("""
+                SELECT 1 FROM feed_items
+                GROUP BY fingerprint HAVING COUNT(*) > 1 LIMIT 1
+            """).fetchone()
+            if has_dups:
+                conn.execute("DROP INDEX IF EXISTS idx_items_fingerprint")
+                conn.execute("DROP INDEX IF EXISTS idx_items_published")
+                removed = conn.execute("""
                     DELETE FROM feed_items
-                    WHERE fingerprint=? AND id != ?
-                """, (dup["fingerprint"], dup["keep_id"]))
-                removed += result.rowcount
-
+                    WHERE rowid NOT IN (
+                        SELECT MIN(rowid) FROM feed_items GROUP BY fingerprint
+                    )
+                """).rowcount
+                conn.execute("CREATE INDEX idx_items_fingerprint ON feed_items(fingerprint)")
+                conn.execute("CREATE INDEX idx_items_published ON feed_items(published_at DESC)")
+
+        if removed:
+            # Bulk deletes leave FTS segments fragmented.
+            self.optimize()
         return {"duplicates_removed": removed}
 
+    def optimize(self) -> None:
+        """Compact the file, rebuild the FTS5 index and refresh planner stats."""
+        conn = self._connect()
+        conn.execute("VACUUM")
+        # feed_items has no INTEGER PRIMARY KEY, so VACUUM is allowed to
+        # renumber its rowids. Rebuilding re-keys the external-content FTS
+        # index and leaves it fully merged, as 'optimize' would.
+        with conn:
+            conn.execute("INSERT INTO feed_items_fts(feed_items_fts) VALUES('rebuild')")
+            conn.execute("UPDATE feed_items_meta SET rowid_epoch = rowid_epoch + 1 WHERE id = 1")
+        conn.execute("PRAGMA optimize")
+
     def export_opml(self) -> str:
         """Export all feeds as OPML XML."""
         feeds = self.list_feeds()
@@ -397,11 +841,13 @@ class RSSAggregator:
             categories.setdefault(feed.category, []).append(feed)
 
         for cat, cat_feeds in sorted(categories.items()):
-            lines.append(f'    <outline text="{cat}" title="{cat}">')
+            cat_attr = quoteattr(cat)
+            lines.append(f'    <outline text={cat_attr} title={cat_attr}>')
             for f in cat_feeds:
+                name_attr = quoteattr(f.name)
                 lines.append(
-                    f'      <outline type="rss" text="{f.name}" '
-                    f'title="{f.name}" xmlUrl="{f.url}"/>'
+                    f'      <outline type="rss" text={name_attr} '
+                    f'title={name_attr} xmlUrl={quoteattr(f.url)}/>'
                 )
             lines.append('    </outline>')
 
@@ -412,11 +858,12 @@ class RSSAggregator:
         with self._connect() as conn:
             if status:
                 rows = conn.execute(
-                    "SELECT * FROM feeds WHERE status=? ORDER BY name", (status,)
+                    f"SELECT {_FEED_COLUMNS} FROM feeds WHERE status=? ORDER BY name",
+                    (status,)
                 ).fetchall()
             else:
-                rows = conn.execute("SELECT * FROM feeds ORDER BY name").fetchall()
-        return [Feed(**dict(r)) for r in rows]
+                rows = conn.execute(f"SELECT {_FEED_COLUMNS} FROM feeds ORDER BY name").fetchall()
+        return [Feed(*r) for r in rows]
 
     def pause_feed(self, feed_id: str) -> bool:
         with self._connect() as conn:
@@ -434,17 +881,14 @@ class RSSAggregator:
 
     def get_stats(self) -> dict:
         with self._connect() as conn:
-            total_feeds = conn.execute("SELECT COUNT(*) FROM feeds").fetchone()[0]
-            active_feeds = conn.execute(
-                "SELECT COUNT(*) FROM feeds WHERE status='active'"
-            ).fetchone()[0]
-            total_items = conn.execute("SELECT COUNT(*) FROM feed_items").fetchone()[0]
-            unread = conn.execute(
-                "SELECT COUNT(*) FROM feed_items WHERE is_read=0"
-            ).fetchone()[0]
-            bookmarked = conn.execute(
-                "SELECT COUNT(*) FROM feed_items WHERE is_bookmarked=1"
-            ).fetchone()[0]
+            total_feeds, active_feeds = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(status='active'), 0) FROM feeds
+            """).fetchone()
+            total_items, unread, bookmarked = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(is_read=0), 0),
+                       COALESCE(SUM(is_bookmarked=1), 0)
+                FROM feed_items
+            """).fetchone()
         return {
             "total_feeds": total_feeds,
             "active_feeds": active_feeds,
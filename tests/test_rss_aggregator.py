@@ -1,10 +1,46 @@
+import hashlib
+import sqlite3
+import xml.etree.ElementTree as ET
+
 import pytest
+import rss_aggregator
 from rss_aggregator import (
     RSSAggregator, Feed, FeedItem, AggregatorConfig,
-    FeedStatus, create_aggregator,
+    FeedStatus, BloomFilter, create_aggregator,
 )
 
 
+class FailingBegin:
+    """Connection wrapper whose BEGIN IMMEDIATEs raise after the first ``after``.
+
+    Up to ``failures`` attempts raise (all of them when None); later ones pass.
+    """
+
+    def __init__(self, conn, error, failures=None, after=0):
+        self._conn = conn
+        self._error = error
+        self._failures = failures
+        self._after = after
+        self.attempts = 0
+
+    def execute(self, sql, *args):
+        if sql == "BEGIN IMMEDIATE":
+            self.attempts += 1
+            failed = self.attempts - self._after
+            if failed > 0 and (self._failures is None or failed <= self._failures):
+                raise self._error
+        return self._conn.execute(sql, *args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
 @pytest.fixture
 def agg(tmp_path):
     return RSSAggregator(db_path=str(tmp_path / "test_rss.db"))
@@ -22,6 +58,7 @@ class TestFeedManagement:
     def test_add_feed(self, agg):
         feed = agg.add_feed("Test Feed", "https://example.com/feed.rss", category="tech")
         assert feed.id is not None
+        assert len(feed.id) == 32
         assert feed.name == "Test Feed"
         assert feed.status == FeedStatus.ACTIVE.value
 
@@ -30,11 +67,25 @@ class TestFeedManagement:
         f2 = agg.add_feed("Test Again", "https://example.com/feed.rss")
         assert f1.id == f2.id
 
+    def test_bulk_add_feeds(self, agg):
+        existing = agg.add_feed("Existing", "https://example.com/a.rss")
+        feeds = agg.bulk_add_feeds([
+            {"name": "A again", "url": "https://example.com/a.rss"},
+            {"name": "B", "url": "https://example.com/b.rss", "category": "science"},
+            {"name": "B again", "url": "https://example.com/b.rss"},
+        ])
+        assert feeds[0] == existing
+        assert feeds[1].name == "B" and feeds[1].category == "science"
+        assert feeds[2] == feeds[1]
+        assert len(agg.list_feeds()) == 2
+
     def test_get_feed(self, agg):
         f = agg.add_feed("Test", "https://example.com/feed.rss")
         fetched = agg.get_feed(f.id)
         assert fetched is not None
         assert fetched.name == "Test"
+        assert fetched == f
+        assert agg.get_feed_by_url("https://example.com/feed.rss") == f
 
     def test_pause_resume_feed(self, agg):
         f = agg.add_feed("Test", "https://example.com/feed.rss")
@@ -48,6 +99,9 @@ class TestFeedManagement:
     def test_list_feeds(self, agg_with_feeds):
         feeds = agg_with_feeds.list_feeds()
         assert len(feeds) == 3
+        assert [f.name for f in feeds] == ["General Feed", "Science Feed", "Tech Feed"]
+        agg_with_feeds.pause_feed(feeds[0].id)
+        assert [f.id for f in agg_with_feeds.list_feeds(status="paused")] == [feeds[0].id]
 
 
 class TestFeedRefresh:
@@ -73,10 +127,291 @@ class TestFeedRefresh:
         with pytest.raises(ValueError):
             agg.refresh("nonexistent-id")
 
+    def test_refresh_failure_rolls_back_batch(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        good = {"title": "Good", "url": "https://example.com/good", "summary": "ok"}
+        bad = {"title": "Bad", "url": "https://example.com/bad", "summary": object()}
+        monkeypatch.setattr(agg, "_simulate_fetch", lambda feed: [good, bad])
+        with pytest.raises(Exception):
+            agg.refresh(f.id)
+        assert agg.get_items(f.id) == []
+        assert agg.get_feed(f.id).status == FeedStatus.ERROR.value
+
+    def test_refresh_dedupes_within_batch(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss")
+        item = {"title": "Same", "url": "https://example.com/same"}
+        monkeypatch.setattr(agg, "_simulate_fetch", lambda feed: [item, dict(item)])
+        result = agg.refresh(f.id)
+        assert result["new_items"] == 1
+        assert result["duplicates"] == 1
+
+    def test_refresh_stamps_items_and_feed_with_one_time(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss")
+        items = [{"title": f"Item {i}", "url": f"https://example.com/{i}"} for i in range(3)]
+        monkeypatch.setattr(agg, "_simulate_fetch", lambda feed: items)
+        agg.refresh(f.id)
+        stored = agg.get_items(f.id)
+        stamps = {i.created_at for i in stored} | {i.published_at for i in stored}
+        assert stamps == {agg.get_feed(f.id).last_fetched}
+
+    def test_refresh_dedupes_across_instances(self, tmp_path):
+        db = str(tmp_path / "shared.db")
+        a1 = RSSAggregator(db_path=db)
+        f = a1.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        a1.refresh(f.id)
+        a2 = RSSAggregator(db_path=db)
+        result = a2.refresh(f.id)
+        assert result["new_items"] == 0
+        assert result["duplicates"] > 0
+
+    def test_open_migrates_legacy_fingerprints(self, tmp_path):
+        db = str(tmp_path / "legacy.db")
+        a1 = RSSAggregator(db_path=db)
+        f = a1.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        legacy = []
+        for i, item in enumerate(RSSAggregator.SAMPLE_FEEDS["tech-news"]):
+            text = f"{item['title'].lower().strip()}{item['url'].lower().strip()}"
+            sha = hashlib.sha256(text.encode()).hexdigest()[:16]
+            legacy.append((i, item["title"], item["url"], sha))
+        # A stray copy of the first item under a different fingerprint.
+        legacy.append((99, legacy[0][1], legacy[0][2], "0" * 16))
+        with a1._connect() as conn:
+            for i, title, url, sha in legacy:
+                conn.execute("""
+                    INSERT INTO feed_items
+                    (id, feed_id, title, url, published_at, fingerprint, created_at)
+                    VALUES (?, ?, ?, ?, '2024-01-01', ?, '2024-01-01')
+                """, (f"legacy-{i}", f.id, title, url, sha))
+            conn.execute("PRAGMA user_version=0")
+        a1.close()
+
+        a2 = RSSAggregator(db_path=db)
+        items = a2.get_items(f.id)
+        assert len(items) == 3
+        assert all(i.fingerprint == RSSAggregator._fingerprint(i.title, i.url) for i in items)
+        result = a2.refresh(f.id)
+        assert result["new_items"] == 0
+        assert a2._connect().execute("PRAGMA user_version").fetchone()[0] == 1
+
+    def test_refresh_applies_config_limits(self, tmp_path):
+        config = AggregatorConfig(max_items_per_feed=2, max_summary_length=10)
+        a = RSSAggregator(db_path=str(tmp_path / "limits.db"), config=config)
+        f = a.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        assert a.refresh(f.id)["new_items"] == 2
+        assert all(len(i.summary) <= 10 for i in a.get_items(f.id))
+
+    def test_bulk_refresh_many_indexes_new_items(self, agg_with_feeds):
+        feeds = agg_with_feeds.list_feeds()
+        agg_with_feeds.pause_feed(feeds[0].id)
+        results = agg_with_feeds.bulk_refresh_many([f.id for f in feeds])
+        assert [r["feed_id"] for r in results] == [f.id for f in feeds]
+        assert results[0]["skipped"] is True
+        assert all(r["new_items"] > 0 for r in results[1:])
+        assert [i.title for i in agg_with_feeds.search("Mars")] == ["Mars Mission Update"]
+        # The insert trigger is restored, so later refreshes stay searchable.
+        agg_with_feeds.resume_feed(feeds[0].id)
+        agg_with_feeds.refresh(feeds[0].id)
+        assert agg_with_feeds.search("Sample")
+
+    def test_bulk_refresh_many_rolls_back_on_failure(self, agg_with_feeds, monkeypatch):
+        feeds = agg_with_feeds.list_feeds()
+        real_fetch = agg_with_feeds._simulate_fetch
+
+        def fetch(feed):
+            if feed.id == feeds[-1].id:
+                return [{"title": "Bad", "url": "https://example.com/bad", "summary": object()}]
+            return real_fetch(feed)
+
+        monkeypatch.setattr(agg_with_feeds, "_simulate_fetch", fetch)
+        with pytest.raises(Exception):
+            agg_with_feeds.bulk_refresh_many([f.id for f in feeds])
+        assert agg_with_feeds.get_stats()["total_items"] == 0
+        assert agg_with_feeds.get_feed(feeds[-1].id).status == FeedStatus.ERROR.value
+        triggers = {r[0] for r in agg_with_feeds._connect().execute(
+            "SELECT name FROM sqlite_master WHERE type='trigger'")}
+        assert "feed_items_ai" in triggers
+
+    def test_refresh_dedupes_across_open_instances(self, tmp_path):
+        db = str(tmp_path / "shared.db")
+        a1 = RSSAggregator(db_path=db)
+        a2 = RSSAggregator(db_path=db)
+        f = a1.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        assert a1.refresh(f.id)["new_items"] == 3
+        result = a2.refresh(f.id)
+        assert result["new_items"] == 0
+        assert result["duplicates"] == 3
+        assert a2.get_stats()["total_items"] == 3
+
+    def test_refresh_dedupes_after_other_instance_reuses_rowids(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "shared.db")
+        a1 = RSSAggregator(db_path=db)
+        a2 = RSSAggregator(db_path=db)
+        f = a1.add_feed("Tech", "https://example.com/feed.rss")
+        items = [{"title": f"I{i}", "url": f"https://example.com/{i}"} for i in range(3)]
+        monkeypatch.setattr(a1, "_simulate_fetch", lambda feed: items)
+        a1.refresh(f.id)
+        with a1._connect() as conn:
+            conn.execute("""
+                INSERT INTO feed_items
+                (id, feed_id, title, url, published_at, fingerprint, created_at)
+                SELECT 'copy', feed_id, title, url, published_at, fingerprint, created_at
+                FROM feed_items WHERE rowid = 3
+            """)
+        a1.refresh(f.id)
+        assert a1._bloom_mark[1] == 4
+        # a2 frees rowid 4 and stores a new item in it.
+        assert a2.deduplicate()["duplicates_removed"] == 1
+        new = {"title": "X", "url": "https://example.com/x"}
+        monkeypatch.setattr(a2, "_simulate_fetch", lambda feed: [new])
+        assert a2.refresh(f.id)["new_items"] == 1
+        monkeypatch.setattr(a1, "_simulate_fetch", lambda feed: [new])
+        assert a1.refresh(f.id)["new_items"] == 0
+        assert [i.title for i in a1.search("X")] == ["X"]
+
+    def test_rolled_back_bulk_refresh_does_not_advance_bloom_mark(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "shared.db")
+        a1 = RSSAggregator(db_path=db)
+        a2 = RSSAggregator(db_path=db)
+        good = a1.add_feed("Tech", "https://example.com/tech.rss", category="tech-news")
+        bad = a1.add_feed("Bad", "https://example.com/bad.rss")
+        real_fetch = a1._simulate_fetch
+
+        def fetch(feed):
+            if feed.id == bad.id:
+                return [{"title": "Bad", "url": "https://example.com/bad", "summary": object()}]
+            return real_fetch(feed)
+
+        monkeypatch.setattr(a1, "_simulate_fetch", fetch)
+        with pytest.raises(Exception):
+            a1.bulk_refresh_many([good.id, bad.id])
+        assert a1.get_stats()["total_items"] == 0
+        # a2 commits unseen items into the rowids the rolled-back batch used.
+        items = [{"title": f"New {i}", "url": f"https://example.com/new/{i}"} for i in range(3)]
+        monkeypatch.setattr(a2, "_simulate_fetch", lambda feed: items)
+        assert a2.refresh(good.id)["new_items"] == 3
+        monkeypatch.setattr(a1, "_simulate_fetch", lambda feed: items)
+        assert a1.refresh(good.id)["new_items"] == 0
+        assert a1.get_stats()["total_items"] == 3
+
+    def test_bulk_refresh_many_begin_failure_blames_no_feed(self, agg_with_feeds, monkeypatch):
+        feeds = agg_with_feeds.list_feeds()
+        failing = FailingBegin(agg_with_feeds._connect(),
+                               sqlite3.OperationalError("disk I/O error"))
+        monkeypatch.setattr(agg_with_feeds, "_connect", lambda: failing)
+        with pytest.raises(sqlite3.OperationalError):
+            agg_with_feeds.bulk_refresh_many([f.id for f in feeds])
+        monkeypatch.undo()
+        assert all(f.status == FeedStatus.ACTIVE.value for f in agg_with_feeds.list_feeds())
+
+    def test_refresh_retries_while_write_lock_is_busy(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        failing = FailingBegin(agg._connect(), sqlite3.OperationalError("database is locked"),
+                               failures=2)
+        monkeypatch.setattr(rss_aggregator, "_BUSY_RETRY_DELAYS", (0, 0, 0))
+        monkeypatch.setattr(agg, "_connect", lambda: failing)
+        assert agg.refresh(f.id)["new_items"] == 3
+        assert failing.attempts == 3
+
+    def test_refresh_lock_timeout_keeps_feed_active(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        failing = FailingBegin(agg._connect(), sqlite3.OperationalError("database is locked"))
+        monkeypatch.setattr(rss_aggregator, "_BUSY_RETRY_DELAYS", (0, 0))
+        monkeypatch.setattr(agg, "_connect", lambda: failing)
+        with pytest.raises(sqlite3.OperationalError):
+            agg.refresh(f.id)
+        assert failing.attempts == 3
+        monkeypatch.undo()
+        assert agg.get_feed(f.id).status == FeedStatus.ACTIVE.value
+
+    def test_refresh_failure_waits_out_busy_lock_to_record_error(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        failing = FailingBegin(agg._connect(), sqlite3.OperationalError("database is locked"),
+                               failures=2, after=1)
+        monkeypatch.setattr(rss_aggregator, "_BUSY_RETRY_DELAYS", (0, 0, 0))
+        monkeypatch.setattr(agg, "_connect", lambda: failing)
+
+        def store(conn, feed_id, raw_items):
+            raise ValueError("bad item")
+
+        monkeypatch.setattr(agg, "_store_items", store)
+        with pytest.raises(ValueError):
+            agg.refresh(f.id)
+        monkeypatch.undo()
+        feed = agg.get_feed(f.id)
+        assert feed.status == FeedStatus.ERROR.value
+        assert feed.error_message == "bad item"
+
+    def test_refresh_failure_reraises_when_error_cannot_be_recorded(self, agg, monkeypatch):
+        f = agg.add_feed("Tech", "https://example.com/feed.rss", category="tech-news")
+        failing = FailingBegin(agg._connect(), sqlite3.OperationalError("database is locked"),
+                               after=1)
+        monkeypatch.setattr(rss_aggregator, "_BUSY_RETRY_DELAYS", (0, 0))
+        monkeypatch.setattr(agg, "_connect", lambda: failing)
+
+        def store(conn, feed_id, raw_items):
+            raise ValueError("bad item")
+
+        monkeypatch.setattr(agg, "_store_items", store)
+        with pytest.raises(ValueError):
+            agg.refresh(f.id)
+        assert failing.attempts == 4
+        monkeypatch.undo()
+        assert agg.get_feed(f.id).status == FeedStatus.ACTIVE.value
+
     def test_refresh_all(self, agg_with_feeds):
         results = agg_with_feeds.refresh_all()
         assert len(results) == 3
 
+    def test_refresh_all_collects_planner_stats(self, agg_with_feeds):
+        agg_with_feeds.refresh_all()
+        conn = agg_with_feeds._connect()
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl='feed_items'"
+        ).fetchone()[0] > 0
+
+    def test_refresh_all_returns_results_when_planner_stats_are_locked(
+            self, agg_with_feeds, monkeypatch):
+        blocker = sqlite3.connect(agg_with_feeds.db_path)
+        real_stats = agg_with_feeds._refresh_planner_stats
+
+        def locked_stats():
+            agg_with_feeds._connect().execute("PRAGMA busy_timeout=0")
+            blocker.execute("BEGIN IMMEDIATE")
+            real_stats()
+
+        monkeypatch.setattr(agg_with_feeds, "_refresh_planner_stats", locked_stats)
+        try:
+            results = agg_with_feeds.refresh_all()
+        finally:
+            blocker.rollback()
+            blocker.close()
+        assert len(results) == 3
+        assert all(r["new_items"] > 0 for r in results)
+        assert agg_with_feeds.get_stats()["total_items"] == 7
+
+    def test_refresh_all_reuses_worker_connections(self, tmp_path):
+        a = RSSAggregator(db_path=str(tmp_path / "pool.db"),
+                          config=AggregatorConfig(max_workers=2))
+        for i in range(4):
+            a.add_feed(f"Tech {i}", f"https://example.com/{i}.rss", category="tech-news")
+        a.refresh_all()
+        first = set(a._conns.values())
+        a.refresh_all()
+        assert first <= set(a._conns.values())
+        assert len(a._conns) <= 3
+        a.close()
+        assert not a._conns
+        assert len(a.refresh_all()) == 4
+
+    def test_refresh_all_concurrent_feeds_store_each_item_once(self, agg):
+        feeds = [agg.add_feed(f"Tech {i}", f"https://example.com/{i}.rss", category="tech-news")
+                 for i in range(12)]
+        results = agg.refresh_all()
+        assert sorted(r["feed_id"] for r in results) == sorted(f.id for f in feeds)
+        assert all("error" not in r for r in results)
+        assert sum(r["new_items"] for r in results) == 3
+        assert agg.get_stats()["total_items"] == 3
+
 
 class TestItemOperations:
     def test_mark_read_unread(self, agg_with_feeds):
@@ -87,6 +422,17 @@ class TestItemOperations:
         agg_with_feeds.mark_read(items[0].id)
         updated = agg_with_feeds.get_items(feeds[0].id, unread_only=True)
         assert all(i.id != items[0].id for i in updated)
+        read = [i for i in agg_with_feeds.get_items(feeds[0].id) if i.id == items[0].id]
+        assert read[0].is_read is True
+        assert read[0].is_bookmarked is False
+
+    def test_mark_read_many(self, agg_with_feeds):
+        feeds = agg_with_feeds.list_feeds()
+        agg_with_feeds.refresh(feeds[0].id)
+        items = agg_with_feeds.get_items(feeds[0].id)
+        updated = agg_with_feeds.mark_read_many([i.id for i in items] + ["missing"])
+        assert updated == len(items)
+        assert agg_with_feeds.get_items(feeds[0].id, unread_only=True) == []
 
     def test_bookmark_unbookmark(self, agg_with_feeds):
         feeds = agg_with_feeds.list_feeds()
@@ -104,6 +450,12 @@ class TestItemOperations:
         results = agg_with_feeds.search("AI")
         assert isinstance(results, list)
 
+    def test_search_in_category(self, agg_with_feeds):
+        agg_with_feeds.refresh_all()
+        tech = agg_with_feeds.search_in_category("AI", "tech-news")
+        assert [i.title for i in tech] == ["AI Breakthrough in 2025"]
+        assert agg_with_feeds.search_in_category("AI", "science") == []
+
     def test_by_category(self, agg_with_feeds):
         agg_with_feeds.refresh_all()
         items = agg_with_feeds.by_category("tech-news")
@@ -113,12 +465,50 @@ class TestItemOperations:
         agg_with_feeds.refresh_all()
         result = agg_with_feeds.deduplicate()
         assert "duplicates_removed" in result
+        assert result["duplicates_removed"] == 0
+
+    def test_deduplicate_removes_copies_and_keeps_indexes(self, agg_with_feeds):
+        feeds = agg_with_feeds.list_feeds()
+        agg_with_feeds.refresh(feeds[0].id)
+        original = agg_with_feeds.get_items(feeds[0].id)
+        with agg_with_feeds._connect() as conn:
+            for i, item in enumerate(original):
+                conn.execute("""
+                    INSERT INTO feed_items
+                    (id, feed_id, title, url, summary, author, published_at,
+                     fingerprint, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (f"copy-{i}", item.feed_id, item.title, item.url, item.summary,
+                      item.author, item.published_at, item.fingerprint, item.created_at))
+        result = agg_with_feeds.deduplicate()
+        assert result["duplicates_removed"] == len(original)
+        remaining = agg_with_feeds.get_items(feeds[0].id)
+        assert sorted(i.id for i in remaining) == sorted(i.id for i in original)
+        indexes = {r[0] for r in agg_with_feeds._connect().execute(
+            "SELECT name FROM sqlite_master WHERE type='index'")}
+        assert {"idx_items_fingerprint", "idx_items_published"} <= indexes
+
+    def test_optimize_keeps_search_working(self, agg_with_feeds):
+        agg_with_feeds.refresh_all()
+        before = agg_with_feeds.search("AI")
+        agg_with_feeds.optimize()
+        assert [i.id for i in agg_with_feeds.search("AI")] == [i.id for i in before]
 
     def test_export_opml(self, agg_with_feeds):
         opml = agg_with_feeds.export_opml()
         assert "opml" in opml.lower()
         assert "outline" in opml
 
+    def test_export_opml_escapes_attributes(self, agg):
+        agg.add_feed('Tom & Jerry "News"', "https://example.com/feed?a=1&b=<2>",
+                     category="r&d")
+        root = ET.fromstring(agg.export_opml())
+        category = root.find("body/outline")
+        assert category.get("text") == "r&d"
+        feed = category.find("outline")
+        assert feed.get("title") == 'Tom & Jerry "News"'
+        assert feed.get("xmlUrl") == "https://example.com/feed?a=1&b=<2>"
+
     def test_get_stats(self, agg_with_feeds):
         agg_with_feeds.refresh_all()
         stats = agg_with_feeds.get_stats()
@@ -126,6 +516,67 @@ class TestItemOperations:
         assert stats["total_feeds"] == 3
         assert stats["total_items"] > 0
 
+    def test_get_stats_counts(self, agg_with_feeds):
+        assert agg_with_feeds.get_stats() == {
+            "total_feeds": 3, "active_feeds": 3, "total_items": 0,
+            "unread_items": 0, "bookmarked_items": 0,
+        }
+        feeds = agg_with_feeds.list_feeds()
+        agg_with_feeds.pause_feed(feeds[0].id)
+        agg_with_feeds.refresh(feeds[1].id)
+        items = agg_with_feeds.get_items(feeds[1].id)
+        agg_with_feeds.mark_read(items[0].id)
+        agg_with_feeds.bookmark(items[0].id)
+        stats = agg_with_feeds.get_stats()
+        assert stats["active_feeds"] == 2
+        assert stats["total_items"] == len(items)
+        assert stats["unread_items"] == len(items) - 1
+        assert stats["bookmarked_items"] == 1
+
     def test_create_aggregator_factory(self, tmp_path):
         a = create_aggregator(str(tmp_path / "factory.db"))
         assert a is not None
+
+
+class TestConnection:
+    def test_connection_reused_and_reopened_after_close(self, agg):
+        conn = agg._connect()
+        assert agg._connect() is conn
+        agg.close()
+        assert agg._connect() is not conn
+        assert agg.get_stats()["total_feeds"] == 0
+
+    def test_database_uses_wal(self, agg):
+        conn = agg._connect()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+class TestFingerprint:
+    def test_normalizes_case_and_whitespace(self):
+        fp = RSSAggregator._fingerprint("  Hello World ", "HTTPS://Example.com/a ")
+        assert fp == RSSAggregator._fingerprint("hello world", "https://example.com/a")
+        assert len(fp) == 16
+
+    def test_value_is_stable(self):
+        # Pins the current scheme. Changing it requires bumping _SCHEMA_VERSION
+        # with a migration in _migrate that rewrites stored fingerprints.
+        fp = RSSAggregator._fingerprint("AI Breakthrough in 2025", "https://example.com/ai-2025")
+        assert fp == "cfdebfd1622f4f58"
+
+    def test_separator_prevents_boundary_collisions(self):
+        assert RSSAggregator._fingerprint("ab", "c") != RSSAggregator._fingerprint("a", "bc")
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000)
+        fps = [RSSAggregator._fingerprint(f"title {i}", f"https://example.com/{i}")
+               for i in range(1000)]
+        for fp in fps:
+            bloom.add(fp)
+        assert all(fp in bloom for fp in fps)
+
+    def test_empty_filter_misses(self):
+        bloom = BloomFilter(capacity=10)
+        assert RSSAggregator._fingerprint("a", "b") not in bloom